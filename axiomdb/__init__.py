@@ -0,0 +1,9 @@
+from ._lazy import lazy_exports
+
+__all__ = ["AxiomDB", "IngestPipeline", "QueryCache"]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "AxiomDB": ".core",
+    "IngestPipeline": ".ingest",
+    "QueryCache": ".cache",
+})
@@ -0,0 +1,111 @@
+import sys
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def normalize_query(text: str) -> str:
+    """Default cache key normalization: NFC and collapsed whitespace."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class QueryCache:
+    """
+    Bounded LRU/TTL cache of search results.
+
+    Entries are keyed by normalized query text and k, and tagged with the
+    index generation they were computed at. A lookup made at a different
+    generation is a miss, so results never outlive an add or delete.
+    Memory is bounded by an estimate of the bytes held by keys and
+    results; least recently used entries are evicted first.
+
+    AxiomDB searches the normalized text when a cache is attached, so the
+    normalizer must be idempotent and should only fold differences the
+    application considers irrelevant.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 16 * 1024 * 1024,
+        ttl: Optional[float] = None,
+        normalizer: Callable[[str], str] = normalize_query,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.normalizer = normalizer
+
+        # key -> (results, generation, expires_at, cost seconds, size bytes)
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[List[str], int, float, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.saved_seconds = 0.0
+
+    def get(self, text: str, k: int, generation: int) -> Optional[List[str]]:
+        """Return cached results, or None on a miss."""
+        key = (self.normalizer(text), k)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                results, gen, expires_at, cost, _ = entry
+                if gen == generation and time.monotonic() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    self.saved_seconds += cost
+                    return list(results)
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def put(self, text: str, k: int, generation: int, results: List[str], cost: float) -> None:
+        """Cache results computed in cost seconds at the given generation."""
+        key = (self.normalizer(text), k)
+        results = list(results)
+        size = (
+            sys.getsizeof(key[0])
+            + sys.getsizeof(results)
+            + sum(sys.getsizeof(r) for r in results)
+        )
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (results, generation, expires_at, cost, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key: Tuple[str, int]) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry[4]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rate, latency saved and occupancy."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "saved_seconds": self.saved_seconds,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
@@ -1,9 +1,15 @@
-from typing import Any, Dict, List, Optional
+from __future__ import annotations
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from .cache import QueryCache
 from .tokenizers.base import BaseTokenizer
 from .encoders.base import BaseEncoder
 from .index.base import BaseIndex
 from .store.base import BaseStore
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 class AxiomDB:
     """AxiomDB orchestrator connecting tokenizer, encoder, index, and store."""
@@ -14,17 +20,23 @@ class AxiomDB:
         encoder: BaseEncoder,
         index: BaseIndex,
         store: BaseStore,
+        cache: Optional[QueryCache] = None,
     ):
         self.tokenizer = tokenizer
         self.encoder = encoder
         self.index = index
         self.store = store
+        self.cache = cache
 
         # internal ID counter
         self._next_internal_id = 0
 
-        # external string ID -> internal ID
+        # external string ID -> internal ID, and back
         self._ext_to_int = {}
+        self._int_to_ext = {}
+
+        # bumped on every add/delete so cached search results go stale
+        self._generation = 0
 
     def add(self, external_id: str, text: str, metadata: Dict[str, Any]) -> int:
         """Add a document and return its internal ID."""
@@ -35,6 +47,7 @@ class AxiomDB:
         internal_id = self._next_internal_id
         self._next_internal_id += 1
         self._ext_to_int[external_id] = internal_id
+        self._int_to_ext[internal_id] = external_id
 
         # store metadata
         self.store.add(internal_id, metadata)
@@ -45,29 +58,109 @@ class AxiomDB:
 
         # index vector
         self.index.add(vec, internal_id)
+        self._generation += 1
 
         return internal_id
 
+    def add_embeddings(
+        self,
+        external_ids: List[str],
+        vecs: np.ndarray,
+        metadatas: List[Dict[str, Any]],
+    ) -> List[int]:
+        """Add already encoded documents in bulk and return their internal IDs."""
+        if not (len(external_ids) == len(vecs) == len(metadatas)):
+            raise ValueError("external_ids, vecs and metadatas must have the same length")
+        if len(set(external_ids)) != len(external_ids):
+            raise ValueError("duplicate external_id in batch")
+        for external_id in external_ids:
+            if external_id in self._ext_to_int:
+                raise ValueError("external_id already exists")
+
+        # assign internal IDs
+        start = self._next_internal_id
+        internal_ids = list(range(start, start + len(external_ids)))
+        self._next_internal_id += len(external_ids)
+        self._ext_to_int.update(zip(external_ids, internal_ids))
+        self._int_to_ext.update(zip(internal_ids, external_ids))
+
+        # store metadata
+        self.store.add_many(internal_ids, metadatas)
+
+        # index vectors
+        self.index.add_batch(vecs, internal_ids)
+        self._generation += 1
+
+        return internal_ids
+
+    def delete(self, external_id: str) -> bool:
+        """Delete a document. Returns False if it does not exist."""
+        internal_id = self._ext_to_int.get(external_id)
+        if internal_id is None:
+            return False
+
+        # index first: if it fails, nothing has been removed yet
+        self.index.delete(internal_id)
+        try:
+            del self._ext_to_int[external_id]
+            del self._int_to_ext[internal_id]
+            self.store.delete(internal_id)
+        finally:
+            # the index has changed even if the store delete failed
+            self._generation += 1
+        return True
+
     def search(self, text: str, k: int) -> List[str]:
         """Search nearest neighbors by text query."""
+        # deleted vectors still occupy the index, which cannot return
+        # more neighbors than there are live ones
+        k = min(k, len(self._int_to_ext))
+        if k <= 0:
+            return []
+
+        generation = self._generation
+        if self.cache is not None:
+            # tokenize the cache key, not the raw text, so a hit always
+            # returns what a miss would have computed
+            text = self.cache.normalizer(text)
+            cached = self.cache.get(text, k, generation)
+            if cached is not None:
+                return cached
+        t0 = time.perf_counter()
+
         token_ids = self.tokenizer.tokenize(text)
         vec = self.encoder.embed_tokens(token_ids)
         ids, _ = self.index.search(vec, k)
 
         # map internal back to external
-        result = []
-        for iid in ids:
-            for ext, x in self._ext_to_int.items():
-                if x == iid:
-                    result.append(ext)
-                    break
+        result = [self._int_to_ext[iid] for iid in ids if iid in self._int_to_ext]
+
+        if self.cache is not None:
+            self.cache.put(text, k, generation, result, time.perf_counter() - t0)
         return result
 
+    def generation(self) -> int:
+        """Counter bumped by every add and delete."""
+        return self._generation
+
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Query cache hit rate and latency saved, or None without a cache."""
+        if self.cache is None:
+            return None
+        return self.cache.stats()
+
     def get_metadata(self, external_id: str) -> Optional[Dict[str, Any]]:
         if external_id not in self._ext_to_int:
             return None
         iid = self._ext_to_int[external_id]
         return self.store.get(iid)
 
+    def get_metadata_many(self, external_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Fetch metadata for many documents with one store round trip."""
+        iids = [self._ext_to_int.get(ext) for ext in external_ids]
+        found = self.store.get_many([iid for iid in iids if iid is not None])
+        it = iter(found)
+        return [next(it) if iid is not None else None for iid in iids]
+
     def count(self) -> int:
         return self.store.count()
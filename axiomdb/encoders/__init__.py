@@ -0,0 +1,8 @@
+from .._lazy import lazy_exports
+
+__all__ = ["BaseEncoder", "HFBERTEncoder"]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "BaseEncoder": ".base",
+    "HFBERTEncoder": ".hf_bert",
+})
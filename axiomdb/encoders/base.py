@@ -1,6 +1,9 @@
+from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import List
-import numpy as np
+from typing import TYPE_CHECKING, List
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 class BaseEncoder(ABC):
@@ -1,36 +1,55 @@
-from typing import List
-import numpy as np
-import torch
-from transformers import AutoModel
+from __future__ import annotations
+from typing import TYPE_CHECKING, List, Optional
 from .base import BaseEncoder
 
+if TYPE_CHECKING:
+    import numpy as np
+    import torch
+
 
 class HFBERTEncoder(BaseEncoder):
-    """HuggingFace BERT encoder that accepts token ID sequences."""
+    """
+    HuggingFace BERT encoder that accepts token ID sequences.
+
+    torch and the model weights are loaded on the first embed call; dim()
+    only reads the model config.
+    """
 
     def __init__(self, model_name: str = "distilbert-base-uncased"):
-        self._model = AutoModel.from_pretrained(model_name)
-        self._model.eval()
-        sample = torch.zeros((1, 1), dtype=torch.long)
-        with torch.no_grad():
-            out = self._model(sample)
-        self._dim = out.last_hidden_state.shape[-1]
+        self._model_name = model_name
+        self._model = None
+        self._dim: Optional[int] = None
+
+    def _get_model(self):
+        if self._model is None:
+            from transformers import AutoModel
+
+            model = AutoModel.from_pretrained(self._model_name)
+            model.eval()
+            self._model = model
+        return self._model
 
     def _pool(self, last_hidden: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
         mask_exp = attention_mask.unsqueeze(-1).expand(last_hidden.size())
-        sum_vectors = torch.sum(last_hidden * mask_exp, dim=1)
-        lengths = torch.clamp(mask_exp.sum(dim=1), min=1e-9)
+        sum_vectors = (last_hidden * mask_exp).sum(dim=1)
+        lengths = mask_exp.sum(dim=1).clamp(min=1e-9)
         return sum_vectors / lengths
 
     def embed_tokens(self, ids: List[int]) -> np.ndarray:
+        import torch
+
+        model = self._get_model()
         ids_tensor = torch.tensor([ids], dtype=torch.long)
         mask = torch.ones_like(ids_tensor)
         with torch.no_grad():
-            out = self._model(ids_tensor, attention_mask=mask)
+            out = model(ids_tensor, attention_mask=mask)
         pooled = self._pool(out.last_hidden_state, mask)
         return pooled[0].numpy()
 
     def embed_tokens_batch(self, batch_ids: List[List[int]]) -> np.ndarray:
+        import torch
+
+        model = self._get_model()
         max_len = max(len(x) for x in batch_ids)
         padded = []
         masks = []
@@ -43,9 +62,17 @@ class HFBERTEncoder(BaseEncoder):
         mask_tensor = torch.tensor(masks, dtype=torch.long)
 
         with torch.no_grad():
-            out = self._model(ids_tensor, attention_mask=mask_tensor)
+            out = model(ids_tensor, attention_mask=mask_tensor)
         pooled = self._pool(out.last_hidden_state, mask_tensor)
         return pooled.numpy()
 
     def dim(self) -> int:
+        if self._dim is None:
+            if self._model is not None:
+                config = self._model.config
+            else:
+                from transformers import AutoConfig
+
+                config = AutoConfig.from_pretrained(self._model_name)
+            self._dim = config.hidden_size
         return self._dim
@@ -0,0 +1,9 @@
+from .._lazy import lazy_exports
+
+__all__ = ["BaseIndex", "EfAutotuner", "HNSWLibIndex"]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "BaseIndex": ".base",
+    "EfAutotuner": ".autotune",
+    "HNSWLibIndex": ".hnswlib_index",
+})
@@ -0,0 +1,144 @@
+from __future__ import annotations
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+if TYPE_CHECKING:
+    from .hnswlib_index import HNSWLibIndex
+
+
+DEFAULT_CANDIDATES = (8, 12, 16, 24, 32, 48, 64, 96, 128, 192, 256, 384, 512, 768, 1024)
+
+
+def exact_knn(index: HNSWLibIndex, queries: np.ndarray, k: int, block: int = 8192) -> np.ndarray:
+    """Brute-force cosine top-k labels over every vector in the index."""
+    ids = np.asarray(index.ids(), dtype=np.int64)
+    q = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+    k = min(k, len(ids))
+
+    best_sim = np.full((len(q), 0), -np.inf, dtype=np.float32)
+    best_ids = np.empty((len(q), 0), dtype=np.int64)
+    for start in range(0, len(ids), block):
+        block_ids = ids[start:start + block]
+        vecs = np.asarray(index.get_vectors(block_ids.tolist()), dtype=np.float32)
+        vecs /= np.maximum(np.linalg.norm(vecs, axis=1, keepdims=True), 1e-12)
+        sim = np.concatenate([best_sim, q @ vecs.T], axis=1)
+        cand = np.concatenate([best_ids, np.broadcast_to(block_ids, (len(q), len(block_ids)))], axis=1)
+        top = np.argpartition(-sim, k - 1, axis=1)[:, :k] if sim.shape[1] > k else np.argsort(-sim, axis=1)
+        best_sim = np.take_along_axis(sim, top, axis=1)
+        best_ids = np.take_along_axis(cand, top, axis=1)
+
+    order = np.argsort(-best_sim, axis=1)
+    return np.take_along_axis(best_ids, order, axis=1)
+
+
+class EfAutotuner:
+    """
+    Picks the smallest HNSW ef per k that reaches a target recall.
+
+    Tuning needs held-out queries, i.e. vectors that are not in the
+    index: an indexed vector (even perturbed) makes HNSW look far better
+    than it is, because the graph walk lands right next to it. Queries
+    are either passed to tune() or collected from real search traffic,
+    which the index feeds into a reservoir sample via record_queries().
+
+    For each k, candidate ef values are tried in increasing order, which
+    is also increasing latency, and the first one whose recall against
+    exact search meets target_recall is stored in the index's k -> ef
+    policy.
+
+    Attached to an index with HNSWLibIndex.set_autotuner, a re-tune
+    becomes due once the index holds min_size vectors and again every
+    time it grows by retune_growth since the last tune. The index never
+    tunes inside a write; HNSWLibIndex.maybe_retune() runs a due re-tune
+    once at least min_queries held-out queries have been collected.
+    """
+
+    def __init__(
+        self,
+        target_recall: float = 0.95,
+        ks: Sequence[int] = (1, 10, 100),
+        candidates: Sequence[int] = DEFAULT_CANDIDATES,
+        sample_size: int = 200,
+        min_queries: int = 50,
+        min_size: int = 1000,
+        retune_growth: float = 2.0,
+        seed: Optional[int] = 0,
+    ):
+        self.target_recall = target_recall
+        self.ks = sorted(set(ks))
+        self.candidates = sorted(set(candidates))
+        self.sample_size = sample_size
+        self.min_queries = min_queries
+        self.min_size = min_size
+        self.retune_growth = retune_growth
+        self._rng = np.random.default_rng(seed)
+        self._tuned_size: Optional[int] = None
+        # reservoir of held-out query vectors and how many have been offered
+        self._queries: List[np.ndarray] = []
+        self._seen = 0
+        # (k, ef, recall, latency ms per query) for every measurement of the last tune
+        self.last_report: List[Tuple[int, int, float, float]] = []
+
+    def should_retune(self, size: int) -> bool:
+        """Whether the index has grown past the next re-tune threshold."""
+        if self._tuned_size is None:
+            return size >= self.min_size
+        return size >= self._tuned_size * self.retune_growth
+
+    def record_queries(self, queries: np.ndarray) -> None:
+        """Offer held-out query vectors to the reservoir sample."""
+        queries = np.asarray(queries, dtype=np.float32)
+        for q in queries.reshape(-1, queries.shape[-1]):
+            self._seen += 1
+            if len(self._queries) < self.sample_size:
+                self._queries.append(q.copy())
+            else:
+                j = self._rng.integers(self._seen)
+                if j < self.sample_size:
+                    self._queries[j] = q.copy()
+
+    def held_out_queries(self) -> Optional[np.ndarray]:
+        """Collected queries, or None if fewer than min_queries so far."""
+        if len(self._queries) < self.min_queries:
+            return None
+        return np.stack(self._queries)
+
+    def tune(self, index: HNSWLibIndex, queries: Optional[np.ndarray] = None) -> Dict[int, int]:
+        """
+        Measure recall/latency, install the resulting policy on the index
+        and return it. Without queries the collected held-out queries are
+        used; if there are not enough yet, the policy is left unchanged.
+        """
+        size = index.size()
+        if size == 0:
+            return index.ef_policy()
+        if queries is None:
+            queries = self.held_out_queries()
+            if queries is None:
+                return index.ef_policy()
+        queries = np.asarray(queries, dtype=np.float32)
+
+        ks = [k for k in self.ks if k <= size] or [size]
+        truth = exact_knn(index, queries, max(ks))
+
+        policy = {}
+        report = []
+        for k in ks:
+            expected = truth[:, :k]
+            candidates = sorted({c for c in self.candidates if c > k} | {k})
+            for ef in candidates:
+                t0 = time.perf_counter()
+                labels, _ = index.search_batch(queries, k, ef=ef, record=False)
+                latency = (time.perf_counter() - t0) * 1000 / len(queries)
+                hits = sum(len(set(row) & set(exp)) for row, exp in zip(labels.tolist(), expected.tolist()))
+                recall = hits / expected.size
+                report.append((k, ef, recall, latency))
+                policy[k] = ef
+                if recall >= self.target_recall:
+                    break
+
+        self.last_report = report
+        self._tuned_size = size
+        index.set_ef_policy(policy)
+        return policy
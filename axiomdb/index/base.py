@@ -1,6 +1,9 @@
+from __future__ import annotations
 from abc import ABC, abstractmethod
-import numpy as np
-from typing import List, Tuple
+from typing import TYPE_CHECKING, List, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 class BaseIndex(ABC):
@@ -21,6 +24,11 @@ class BaseIndex(ABC):
         """Add multiple vectors with integer IDs."""
         raise NotImplementedError
 
+    @abstractmethod
+    def delete(self, idx: int) -> None:
+        """Remove a vector so it no longer shows up in search results."""
+        raise NotImplementedError
+
     @abstractmethod
     def search(self, query: np.ndarray, k: int) -> Tuple[List[int], List[float]]:
         """Search k nearest neighbors and return (ids, distances)."""
@@ -30,3 +38,7 @@ class BaseIndex(ABC):
     def size(self) -> int:
         """Return how many elements exist in the index."""
         raise NotImplementedError
+
+    def maybe_retune(self) -> bool:
+        """Run any due search-parameter re-tune. Returns whether one ran."""
+        return False
@@ -1,38 +1,155 @@
-from typing import List, Tuple
+from __future__ import annotations
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 import numpy as np
-import hnswlib
 from .base import BaseIndex
 
+if TYPE_CHECKING:
+    from .autotune import EfAutotuner
+
+DEFAULT_EF = 50
+
 
 class HNSWLibIndex(BaseIndex):
-    """HNSW index implementation using hnswlib with cosine similarity."""
+    """
+    HNSW index implementation using hnswlib with cosine similarity.
+
+    init() only records the parameters; hnswlib is imported and the index
+    memory allocated on the first add or search.
+
+    The search-time ef comes from a k -> ef policy (see EfAutotuner) and
+    can be overridden per call. hnswlib keeps a single ef per index, so
+    searches hold a lock while they set ef and query. Concurrent searches
+    are therefore serialized rather than racing on the shared setting.
+    """
 
     def __init__(self):
         self._index = None
         self._dim = None
+        self._max_elements = None
+        self._ef = None
+        self._ef_policy: Dict[int, int] = {}
+        self._autotuner: Optional[EfAutotuner] = None
+        self._deleted = set()
+        # guards the shared ef setting together with the query using it
+        self._search_lock = threading.Lock()
 
     def init(self, dim: int, max_elements: int = 10000) -> None:
         self._dim = dim
-        self._index = hnswlib.Index(space="cosine", dim=dim)
-        self._index.init_index(
-            max_elements=max_elements,
-            ef_construction=200,
-            M=16
-        )
-        self._index.set_ef(50)
+        self._max_elements = max_elements
+        self._index = None
+        self._deleted = set()
+
+    def _get_index(self):
+        if self._index is None:
+            if self._dim is None:
+                raise RuntimeError("index is not initialized, call init() first")
+            import hnswlib
+
+            index = hnswlib.Index(space="cosine", dim=self._dim)
+            index.init_index(
+                max_elements=self._max_elements,
+                ef_construction=200,
+                M=16
+            )
+            index.set_ef(DEFAULT_EF)
+            self._ef = DEFAULT_EF
+            self._index = index
+        return self._index
+
+    def set_ef_policy(self, policy: Dict[int, int]) -> None:
+        """Install a k -> ef policy used when search() gets no explicit ef."""
+        self._ef_policy = dict(policy)
+
+    def ef_policy(self) -> Dict[int, int]:
+        return dict(self._ef_policy)
+
+    def ef_for(self, k: int) -> int:
+        """ef for k: the policy entry of the smallest tuned k >= k."""
+        tuned = [x for x in self._ef_policy if x >= k]
+        if tuned:
+            ef = self._ef_policy[min(tuned)]
+        elif self._ef_policy:
+            ef = self._ef_policy[max(self._ef_policy)]
+        else:
+            ef = DEFAULT_EF
+        return max(ef, k)
+
+    def set_autotuner(self, tuner: Optional[EfAutotuner]) -> None:
+        """Attach a tuner that collects held-out queries from searches."""
+        self._autotuner = tuner
+
+    def needs_retune(self) -> bool:
+        """Whether the index has grown past the tuner's next threshold."""
+        return self._autotuner is not None and self._autotuner.should_retune(self.size())
+
+    def maybe_retune(self) -> bool:
+        """
+        Re-tune ef if a re-tune is due and enough held-out queries have
+        been collected. Returns whether a new policy was installed.
+
+        Tuning runs an exact search over the whole index, so it is never
+        triggered by add/add_batch. IngestPipeline.run calls it after each
+        run; otherwise call it from a maintenance task or after a bulk load.
+        """
+        if not self.needs_retune() or self._autotuner.held_out_queries() is None:
+            return False
+        self._autotuner.tune(self)
+        return True
+
+    def _set_ef(self, index, ef: int) -> None:
+        if ef != self._ef:
+            index.set_ef(ef)
+            self._ef = ef
 
     def add(self, vec: np.ndarray, idx: int) -> None:
         vec = vec.astype(np.float32)
-        self._index.add_items(vec.reshape(1, -1), [idx])
+        self._get_index().add_items(vec.reshape(1, -1), [idx])
+        self._deleted.discard(idx)
 
     def add_batch(self, vecs: np.ndarray, idxs: List[int]) -> None:
         vecs = vecs.astype(np.float32)
-        self._index.add_items(vecs, idxs)
+        self._get_index().add_items(vecs, idxs)
+        if self._deleted:
+            self._deleted.difference_update(idxs)
 
-    def search(self, query: np.ndarray, k: int) -> Tuple[List[int], List[float]]:
-        query = query.astype(np.float32).reshape(1, -1)
-        labels, distances = self._index.knn_query(query, k)
+    def delete(self, idx: int) -> None:
+        self._get_index().mark_deleted(idx)
+        self._deleted.add(idx)
+
+    def search(self, query: np.ndarray, k: int, ef: Optional[int] = None) -> Tuple[List[int], List[float]]:
+        labels, distances = self.search_batch(query.reshape(1, -1), k, ef=ef)
         return labels[0].tolist(), distances[0].tolist()
 
+    def search_batch(
+        self, queries: np.ndarray, k: int, ef: Optional[int] = None, record: bool = True
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Search many queries at once and return (labels, distances) arrays.
+        With record, the queries are offered to the attached autotuner as
+        held-out tuning queries.
+        """
+        index = self._get_index()
+        ef = max(ef, k) if ef is not None else self.ef_for(k)
+        queries = queries.astype(np.float32)
+        with self._search_lock:
+            if record and self._autotuner is not None:
+                self._autotuner.record_queries(queries)
+            self._set_ef(index, ef)
+            return index.knn_query(queries, k)
+
+    def ids(self) -> List[int]:
+        """Labels of every stored vector."""
+        if self._index is None:
+            return []
+        return [i for i in self._index.get_ids_list() if i not in self._deleted]
+
+    def get_vectors(self, ids: List[int]) -> np.ndarray:
+        """Stored (normalized) vectors for the given labels."""
+        return np.asarray(self._get_index().get_items(ids), dtype=np.float32)
+
     def size(self) -> int:
-        return self._index.get_current_count()
+        """Number of searchable vectors; deleted ones are not counted."""
+        if self._index is None:
+            return 0
+        return self._index.get_current_count() - len(self._deleted)
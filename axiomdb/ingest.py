@@ -0,0 +1,350 @@
+import multiprocessing as mp
+import queue
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from .core import AxiomDB
+from .tokenizers.base import BaseTokenizer
+
+
+# a word together with the whitespace in front of it, so that joining
+# consecutive words reproduces the original text
+_WORD_PATTERN = re.compile(r"\s*\S+")
+
+# end-of-stream marker passed between stages
+_DONE = object()
+
+# (source, page number, text)
+Page = Tuple[str, int, str]
+# (source, page number, chunk number, chunk text, token ids)
+Chunk = Tuple[str, int, int, str, List[int]]
+
+
+def chunk_text(
+    tokenizer: BaseTokenizer,
+    text: str,
+    chunk_tokens: int,
+    overlap_tokens: int,
+) -> List[Tuple[str, List[int]]]:
+    """
+    Split text into chunks of at most chunk_tokens tokens.
+
+    Chunks break on word boundaries and consecutive chunks share up to
+    overlap_tokens tokens worth of trailing words. A single word longer
+    than chunk_tokens is truncated.
+    """
+    if overlap_tokens >= chunk_tokens:
+        raise ValueError("overlap_tokens must be smaller than chunk_tokens")
+
+    words = _WORD_PATTERN.findall(text)
+    if not words:
+        return []
+    word_ids = tokenizer.tokenize_batch(words)
+
+    chunks = []
+    n = len(words)
+    start = 0
+    while start < n:
+        end = start
+        total = 0
+        while end < n and (end == start or total + len(word_ids[end]) <= chunk_tokens):
+            total += len(word_ids[end])
+            end += 1
+
+        ids = [t for w in word_ids[start:end] for t in w][:chunk_tokens]
+        if ids:
+            chunks.append(("".join(words[start:end]).strip(), ids))
+        if end >= n:
+            break
+
+        # walk back over trailing words to build the overlap, always
+        # advancing by at least one word
+        back = end
+        carried = 0
+        while back > start + 1 and carried + len(word_ids[back - 1]) <= overlap_tokens:
+            back -= 1
+            carried += len(word_ids[back])
+        start = back
+    return chunks
+
+
+def _extract_pages(path: str, start: int, stop: int) -> List[Page]:
+    """Process worker: extract the text of pages [start, stop) of a document."""
+    import pymupdf
+
+    with pymupdf.open(path) as doc:
+        return [(path, n, doc[n].get_text()) for n in range(start, stop)]
+
+
+_worker_tokenizer: Optional[BaseTokenizer] = None
+
+
+def _init_chunk_worker(tokenizer: BaseTokenizer) -> None:
+    global _worker_tokenizer
+    _worker_tokenizer = tokenizer
+
+
+def _chunk_pages(pages: List[Page], chunk_tokens: int, overlap_tokens: int) -> List[Chunk]:
+    """Process worker: chunk and tokenize a batch of pages."""
+    out = []
+    for source, page_no, text in pages:
+        chunks = chunk_text(_worker_tokenizer, text, chunk_tokens, overlap_tokens)
+        for i, (chunk, ids) in enumerate(chunks):
+            out.append((source, page_no, i, chunk, ids))
+    return out
+
+
+class StageStats:
+    """Throughput counters for one pipeline stage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.elapsed = 0.0
+        # time spent waiting for the previous stage to produce input
+        self.waiting = 0.0
+        # time spent waiting for the next stage to accept output
+        self.blocked = 0.0
+
+    def busy(self) -> float:
+        """Seconds spent doing work, excluding input and output waits."""
+        return max(self.elapsed - self.waiting - self.blocked, 0.0)
+
+    def throughput(self) -> float:
+        """Items per second over the stage's lifetime (wall clock)."""
+        return self.items / self.elapsed if self.elapsed > 0 else 0.0
+
+    def busy_throughput(self) -> float:
+        """Items per second of busy time; the lowest one is the bottleneck."""
+        busy = self.busy()
+        return self.items / busy if busy > 0 else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.name}: {self.items} items in {self.elapsed:.2f}s "
+            f"({self.throughput():.1f}/s wall, {self.busy_throughput():.1f}/s busy, "
+            f"waiting {self.waiting:.2f}s, blocked {self.blocked:.2f}s)"
+        )
+
+
+class IngestPipeline:
+    """
+    Streaming document ingestion into an AxiomDB instance.
+
+    Stages run concurrently and are connected by bounded queues:
+
+        extract (processes) -> chunk + tokenize (processes)
+            -> encode (thread) -> index + store (caller thread)
+
+    Page extraction works on page ranges and every stage holds at most a
+    fixed number of in-flight items, so memory use does not depend on the
+    size of the corpus. Chunking and tokenization share a stage because
+    chunk boundaries are decided from token counts.
+
+    Documents are opened with pymupdf, so anything it reads (PDF, EPUB,
+    XPS, plain text, ...) can be ingested. Each chunk is stored under the
+    external ID "<path>#p<page>#c<chunk>" with its source, page, chunk
+    number and text as metadata.
+
+    After a successful run the index gets a chance to re-tune its search
+    parameters for its new size (see HNSWLibIndex.maybe_retune).
+    """
+
+    def __init__(
+        self,
+        db: AxiomDB,
+        chunk_tokens: int = 256,
+        overlap_tokens: int = 32,
+        batch_size: int = 32,
+        pages_per_task: int = 8,
+        extract_workers: int = 2,
+        tokenize_workers: int = 2,
+        queue_size: int = 8,
+        mp_context: str = "spawn",
+    ):
+        if overlap_tokens >= chunk_tokens:
+            raise ValueError("overlap_tokens must be smaller than chunk_tokens")
+        self.db = db
+        self.chunk_tokens = chunk_tokens
+        self.overlap_tokens = overlap_tokens
+        self.batch_size = batch_size
+        self.pages_per_task = pages_per_task
+        self.extract_workers = extract_workers
+        self.tokenize_workers = tokenize_workers
+        self.queue_size = queue_size
+        # fork is unsafe once the encoder thread is running torch
+        self.mp_context = mp_context
+
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    def run(self, paths: Iterable[str]) -> List[StageStats]:
+        """Ingest every document in paths and return per-stage stats."""
+        self._stop.clear()
+        self._error = None
+
+        stats = [StageStats(n) for n in ("extract", "tokenize", "encode", "write")]
+        pages_q: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        chunks_q: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        vecs_q: queue.Queue = queue.Queue(maxsize=self.queue_size)
+
+        ctx = mp.get_context(self.mp_context)
+        with ProcessPoolExecutor(self.extract_workers, mp_context=ctx) as extract_pool, \
+                ProcessPoolExecutor(
+                    self.tokenize_workers,
+                    mp_context=ctx,
+                    initializer=_init_chunk_worker,
+                    initargs=(self.db.tokenizer,),
+                ) as chunk_pool:
+            threads = [
+                threading.Thread(
+                    target=self._stage,
+                    args=(stats[0], pages_q, self._extract, extract_pool, paths, pages_q, stats[0]),
+                    name="axiomdb-extract",
+                ),
+                threading.Thread(
+                    target=self._stage,
+                    args=(stats[1], chunks_q, self._tokenize, chunk_pool, pages_q, chunks_q, stats[1]),
+                    name="axiomdb-tokenize",
+                ),
+                threading.Thread(
+                    target=self._stage,
+                    args=(stats[2], vecs_q, self._encode, chunks_q, vecs_q, stats[2]),
+                    name="axiomdb-encode",
+                ),
+            ]
+            for t in threads:
+                t.daemon = True
+                t.start()
+
+            self._stage(stats[3], None, self._write, vecs_q, stats[3])
+
+            for t in threads:
+                t.join()
+            if self._error is not None:
+                extract_pool.shutdown(cancel_futures=True)
+                chunk_pool.shutdown(cancel_futures=True)
+
+        if self._error is not None:
+            raise self._error
+
+        # the index has grown, so a search-parameter re-tune may be due
+        self.db.index.maybe_retune()
+        return stats
+
+    # ---- stage plumbing ----
+
+    def _stage(self, stats: StageStats, out_q: Optional[queue.Queue], fn: Callable, *args: Any) -> None:
+        t0 = time.perf_counter()
+        try:
+            fn(*args)
+        except BaseException as e:
+            if self._error is None:
+                self._error = e
+            self._stop.set()
+        finally:
+            stats.elapsed = time.perf_counter() - t0
+            if out_q is not None:
+                self._put(out_q, _DONE, None)
+
+    def _put(self, q: queue.Queue, item: Any, stats: Optional[StageStats]) -> None:
+        t0 = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        if stats is not None:
+            stats.blocked += time.perf_counter() - t0
+
+    def _drain(self, q: queue.Queue, stats: StageStats) -> Iterator[Any]:
+        while not self._stop.is_set():
+            t0 = time.perf_counter()
+            try:
+                item = q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            finally:
+                stats.waiting += time.perf_counter() - t0
+            if item is _DONE:
+                return
+            yield item
+
+    def _ordered_map(
+        self,
+        pool: ProcessPoolExecutor,
+        fn: Callable,
+        tasks: Iterable[tuple],
+        out_q: queue.Queue,
+        stats: StageStats,
+        max_inflight: int,
+    ) -> None:
+        """Run tasks on a pool with bounded in-flight work, emitting in order."""
+        pending: deque = deque()
+
+        def emit() -> None:
+            result = pending.popleft().result()
+            stats.items += len(result)
+            self._put(out_q, result, stats)
+
+        for task in tasks:
+            if self._stop.is_set():
+                return
+            pending.append(pool.submit(fn, *task))
+            if len(pending) >= max_inflight:
+                emit()
+        while pending and not self._stop.is_set():
+            emit()
+
+    # ---- stages ----
+
+    def _page_ranges(self, paths: Iterable[str]) -> Iterator[Tuple[str, int, int]]:
+        import pymupdf
+
+        for path in paths:
+            with pymupdf.open(path) as doc:
+                n_pages = doc.page_count
+            for start in range(0, n_pages, self.pages_per_task):
+                yield path, start, min(start + self.pages_per_task, n_pages)
+
+    def _extract(self, pool, paths, out_q, stats) -> None:
+        self._ordered_map(
+            pool, _extract_pages, self._page_ranges(paths), out_q, stats, 2 * self.extract_workers
+        )
+
+    def _tokenize(self, pool, in_q, out_q, stats) -> None:
+        tasks = ((pages, self.chunk_tokens, self.overlap_tokens) for pages in self._drain(in_q, stats))
+        self._ordered_map(pool, _chunk_pages, tasks, out_q, stats, 2 * self.tokenize_workers)
+
+    def _encode(self, in_q, out_q, stats) -> None:
+        encoder = self.db.encoder
+        batch: List[Chunk] = []
+
+        def flush() -> None:
+            vecs = encoder.embed_tokens_batch([c[4] for c in batch])
+            stats.items += len(batch)
+            self._put(out_q, (list(batch), vecs), stats)
+            batch.clear()
+
+        for chunks in self._drain(in_q, stats):
+            for chunk in chunks:
+                batch.append(chunk)
+                if len(batch) >= self.batch_size:
+                    flush()
+        if batch and not self._stop.is_set():
+            flush()
+
+    def _write(self, in_q, stats) -> None:
+        for chunks, vecs in self._drain(in_q, stats):
+            ext_ids = [f"{src}#p{page}#c{i}" for src, page, i, _, _ in chunks]
+            metas = [
+                {"source": src, "page": page, "chunk": i, "text": text}
+                for src, page, i, text, _ in chunks
+            ]
+            self.db.add_embeddings(ext_ids, vecs, metas)
+            stats.items += len(chunks)
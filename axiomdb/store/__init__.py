@@ -0,0 +1,8 @@
+from .._lazy import lazy_exports
+
+__all__ = ["BaseStore", "SQLiteStore"]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "BaseStore": ".base",
+    "SQLiteStore": ".sqlite_store",
+})
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 
 class BaseStore(ABC):
@@ -24,3 +24,19 @@ class BaseStore(ABC):
     def count(self) -> int:
         """Number of entries."""
         raise NotImplementedError
+
+    def add_many(self, internal_ids: List[int], metadatas: List[Dict[str, Any]]) -> None:
+        """Store metadata for many internal IDs."""
+        if len(internal_ids) != len(metadatas):
+            raise ValueError("internal_ids and metadatas must have the same length")
+        for internal_id, metadata in zip(internal_ids, metadatas):
+            self.add(internal_id, metadata)
+
+    def get_many(self, internal_ids: List[int]) -> List[Optional[Dict[str, Any]]]:
+        """Retrieve metadata for many internal IDs, in the given order."""
+        return [self.get(internal_id) for internal_id in internal_ids]
+
+    def delete_many(self, internal_ids: List[int]) -> None:
+        """Remove metadata for many internal IDs."""
+        for internal_id in internal_ids:
+            self.delete(internal_id)
@@ -1,16 +1,60 @@
-import sqlite3
 import orjson
-from typing import Any, Dict, Optional
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
 from .base import BaseStore
 
+SYNCHRONOUS_LEVELS = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+# constant SQL so sqlite3's statement cache reuses the prepared statements;
+# bulk reads and deletes pass all IDs as one JSON array parameter
+_INSERT = "INSERT OR REPLACE INTO metadata (id, data) VALUES (?, ?)"
+_SELECT = "SELECT data FROM metadata WHERE id = ?"
+_SELECT_MANY = "SELECT id, data FROM metadata WHERE id IN (SELECT value FROM json_each(?))"
+_DELETE = "DELETE FROM metadata WHERE id = ?"
+_DELETE_MANY = "DELETE FROM metadata WHERE id IN (SELECT value FROM json_each(?))"
+_COUNT = "SELECT COUNT(*) FROM metadata"
+
 
 class SQLiteStore(BaseStore):
-    """SQLite metadata store."""
+    """
+    SQLite metadata store. The database is opened on first use.
 
-    def __init__(self, path: str = "axiomdb_metadata.sqlite"):
+    File databases run in WAL mode with a configurable synchronous level
+    (NORMAL by default, which skips the fsync on every commit) and page
+    cache size. Each add/delete is its own transaction unless wrapped in
+    transaction(); the *_many methods always use a single one.
+    """
+
+    def __init__(
+        self,
+        path: str = "axiomdb_metadata.sqlite",
+        synchronous: str = "NORMAL",
+        cache_size_kib: int = 64 * 1024,
+        wal: bool = True,
+    ):
+        synchronous = synchronous.upper()
+        if synchronous not in SYNCHRONOUS_LEVELS:
+            raise ValueError(f"synchronous must be one of {SYNCHRONOUS_LEVELS}")
         self._path = path
-        self._conn = sqlite3.connect(self._path)
-        self._create_table()
+        self._synchronous = synchronous
+        self._cache_size_kib = cache_size_kib
+        self._wal = wal
+        self._conn = None
+        self._tx_depth = 0
+
+    def _get_conn(self):
+        if self._conn is None:
+            import sqlite3
+
+            # autocommit mode: transactions are started explicitly
+            self._conn = sqlite3.connect(self._path, isolation_level=None)
+            if self._wal and self._path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(f"PRAGMA synchronous={self._synchronous}")
+            self._conn.execute(f"PRAGMA cache_size=-{int(self._cache_size_kib)}")
+            self._conn.execute("PRAGMA temp_store=MEMORY")
+            self._create_table()
+        return self._conn
 
     def _create_table(self) -> None:
         cur = self._conn.cursor()
@@ -22,31 +66,65 @@ class SQLiteStore(BaseStore):
             );
             """
         )
-        self._conn.commit()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group writes into one transaction; nested calls join the outer one."""
+        conn = self._get_conn()
+        if self._tx_depth == 0:
+            conn.execute("BEGIN")
+        self._tx_depth += 1
+        try:
+            yield
+        except BaseException:
+            self._tx_depth -= 1
+            if self._tx_depth == 0:
+                conn.execute("ROLLBACK")
+            raise
+        self._tx_depth -= 1
+        if self._tx_depth == 0:
+            conn.execute("COMMIT")
 
     def add(self, internal_id: int, metadata: Dict[str, Any]) -> None:
         blob = orjson.dumps(metadata)
-        cur = self._conn.cursor()
-        cur.execute(
-            "INSERT OR REPLACE INTO metadata (id, data) VALUES (?, ?)",
-            (internal_id, blob),
-        )
-        self._conn.commit()
+        self._get_conn().execute(_INSERT, (internal_id, blob))
+
+    def add_many(self, internal_ids: List[int], metadatas: List[Dict[str, Any]]) -> None:
+        if len(internal_ids) != len(metadatas):
+            raise ValueError("internal_ids and metadatas must have the same length")
+        rows = [(iid, orjson.dumps(m)) for iid, m in zip(internal_ids, metadatas)]
+        with self.transaction():
+            self._conn.executemany(_INSERT, rows)
 
     def get(self, internal_id: int) -> Optional[Dict[str, Any]]:
-        cur = self._conn.cursor()
-        cur.execute("SELECT data FROM metadata WHERE id = ?", (internal_id,))
-        row = cur.fetchone()
+        row = self._get_conn().execute(_SELECT, (internal_id,)).fetchone()
         if row is None:
             return None
         return orjson.loads(row[0])
 
+    def get_many(self, internal_ids: List[int]) -> List[Optional[Dict[str, Any]]]:
+        if not internal_ids:
+            return []
+        rows = self._get_conn().execute(_SELECT_MANY, (orjson.dumps([int(i) for i in internal_ids]),))
+        found = {iid: data for iid, data in rows}
+        return [
+            orjson.loads(found[iid]) if iid in found else None
+            for iid in internal_ids
+        ]
+
     def delete(self, internal_id: int) -> None:
-        cur = self._conn.cursor()
-        cur.execute("DELETE FROM metadata WHERE id = ?", (internal_id,))
-        self._conn.commit()
+        self._get_conn().execute(_DELETE, (internal_id,))
+
+    def delete_many(self, internal_ids: List[int]) -> None:
+        if not internal_ids:
+            return
+        with self.transaction():
+            self._conn.execute(_DELETE_MANY, (orjson.dumps([int(i) for i in internal_ids]),))
 
     def count(self) -> int:
-        cur = self._conn.cursor()
-        cur.execute("SELECT COUNT(*) FROM metadata")
-        return cur.fetchone()[0]
+        return self._get_conn().execute(_COUNT).fetchone()[0]
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
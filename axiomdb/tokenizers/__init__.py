@@ -0,0 +1,10 @@
+from .._lazy import lazy_exports
+
+__all__ = ["BaseTokenizer", "BinaryBPETokenizer", "CustomBPETokenizer", "HFBPETokenizer"]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "BaseTokenizer": ".base",
+    "BinaryBPETokenizer": ".binary_bpe",
+    "CustomBPETokenizer": ".custom_bpe",
+    "HFBPETokenizer": ".hf_bpe",
+})
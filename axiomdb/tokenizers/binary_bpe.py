@@ -0,0 +1,331 @@
+"""
+Compact binary, memory-mapped BPE model format.
+
+Layout (little-endian, sections 8-byte aligned):
+
+    header         magic, version, vocab size, merge count, table capacity
+                   and the byte offsets of the sections below
+    merge keys     u64[capacity]  (left << 32) | right, EMPTY for free slots
+    merge ranks    u32[capacity]  token ID produced by the merge
+    vocab offsets  u32[vocab_size + 1]  token i is blob[off[i]:off[i + 1]]
+    vocab blob     concatenated token bytes
+
+The merge table is an open-addressing hash table with linear probing, so
+encode and decode read the mapped file directly and every process that
+loads the same file shares its pages.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import regex as re
+
+from .base import BaseTokenizer
+from .custom_bpe import GPT4_SPLIT_PATTERN, gather_decode
+
+MAGIC = b"AXBPE\x00\x00\x00"
+VERSION = 1
+
+# magic, version, vocab_size, n_merges, capacity,
+# keys_off, ranks_off, offsets_off, blob_off, blob_len
+_HEADER = struct.Struct("<8sIIIIQQQQQ")
+
+EMPTY = 0xFFFFFFFFFFFFFFFF
+_GOLDEN = 0x9E3779B97F4A7C15
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+_SPLIT_RE = re.compile(GPT4_SPLIT_PATTERN)
+
+
+def _slot(key: int, shift: int) -> int:
+    return ((key * _GOLDEN) & _MASK64) >> shift
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def _le(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def write_binary(merges: Dict[Tuple[int, int], int], path: str) -> None:
+    """Write a merge table in the binary format."""
+    vocab_size = max(merges.values(), default=255) + 1
+
+    capacity = 2
+    while capacity < 2 * len(merges):
+        capacity *= 2
+    shift = 64 - (capacity.bit_length() - 1)
+    mask = capacity - 1
+
+    keys = array("Q", [EMPTY]) * capacity
+    ranks = array("I", [0]) * capacity
+    for (p0, p1), idx in merges.items():
+        key = (p0 << 32) | p1
+        slot = _slot(key, shift)
+        while keys[slot] != EMPTY:
+            slot = (slot + 1) & mask
+        keys[slot] = key
+        ranks[slot] = idx
+
+    vocab: List[bytes] = [bytes([i]) for i in range(256)] + [b""] * (vocab_size - 256)
+    for (p0, p1), idx in sorted(merges.items(), key=lambda x: x[1]):
+        vocab[idx] = vocab[p0] + vocab[p1]
+    offsets = array("I", [0]) * (vocab_size + 1)
+    pos = 0
+    for i, tok in enumerate(vocab):
+        pos += len(tok)
+        offsets[i + 1] = pos
+    blob = b"".join(vocab)
+
+    keys_off = _align(_HEADER.size)
+    ranks_off = keys_off + 8 * capacity
+    offsets_off = _align(ranks_off + 4 * capacity)
+    blob_off = _align(offsets_off + 4 * (vocab_size + 1))
+
+    header = _HEADER.pack(
+        MAGIC, VERSION, vocab_size, len(merges), capacity,
+        keys_off, ranks_off, offsets_off, blob_off, len(blob),
+    )
+    with open(path, "wb") as f:
+        for off, data in (
+            (0, header),
+            (keys_off, _le(keys)),
+            (ranks_off, _le(ranks)),
+            (offsets_off, _le(offsets)),
+            (blob_off, blob),
+        ):
+            f.write(b"\x00" * (off - f.tell()))
+            f.write(data)
+
+
+def json_to_binary(json_path: str, bin_path: str) -> None:
+    """Convert a CustomBPETokenizer JSON model to the binary format."""
+    with open(json_path, "r") as f:
+        data = json.load(f)
+    write_binary({(p0, p1): idx for p0, p1, idx in data["merges"]}, bin_path)
+
+
+def binary_to_json(bin_path: str, json_path: str) -> None:
+    """Convert a binary model back to the CustomBPETokenizer JSON format."""
+    tok = BinaryBPETokenizer()
+    tok.load(bin_path)
+    try:
+        merges = sorted(tok.iter_merges(), key=lambda m: m[2])
+        data = {"vocab_size": tok.vocab_size(), "merges": [list(m) for m in merges]}
+    finally:
+        tok.close()
+    with open(json_path, "w") as f:
+        json.dump(data, f)
+
+
+class BinaryBPETokenizer(BaseTokenizer):
+    """
+    Byte-level BPE tokenizer backed by a memory-mapped binary model.
+
+    Produces the same token IDs as CustomBPETokenizer for the same merges.
+    Pickling only carries the file path, so worker processes re-map the
+    file instead of copying the model.
+    """
+
+    def __init__(self):
+        self._path: Optional[str] = None
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._vocab_size = 256
+        self._n_merges = 0
+        self._mask = 0
+        self._shift = 64
+        self._keys = None
+        self._ranks = None
+        self._offsets = None
+        self._blob = None
+        self._decode_tables = None
+
+    def load(self, path: str) -> None:
+        """Memory-map a binary model file."""
+        if sys.byteorder != "little":
+            raise RuntimeError("binary BPE models can only be mapped on little-endian hosts")
+        self.close()
+
+        f = open(path, "rb")
+        mm = None
+        try:
+            # mmap refuses empty files, so check the size before mapping
+            if os.fstat(f.fileno()).st_size < _HEADER.size:
+                raise ValueError(f"{path} is corrupt")
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            (magic, version, vocab_size, n_merges, capacity,
+             keys_off, ranks_off, offsets_off, blob_off, blob_len) = _HEADER.unpack_from(mm, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a binary BPE model")
+            if version != VERSION:
+                raise ValueError(f"unsupported binary BPE model version {version}")
+
+            sections = (
+                (keys_off, 8 * capacity),
+                (ranks_off, 4 * capacity),
+                (offsets_off, 4 * (vocab_size + 1)),
+                (blob_off, blob_len),
+            )
+            if (
+                capacity < 2
+                or capacity & (capacity - 1)
+                or vocab_size < 256
+                or any(off < _HEADER.size or off + size > len(mm) for off, size in sections)
+            ):
+                raise ValueError(f"{path} is corrupt")
+            # the last offset-table entry is the blob length
+            end = struct.unpack_from("<I", mm, offsets_off + 4 * vocab_size)[0]
+            if end != blob_len:
+                raise ValueError(f"{path} is corrupt")
+        except BaseException:
+            if mm is not None:
+                mm.close()
+            f.close()
+            raise
+
+        view = memoryview(mm)
+        self._path = path
+        self._file = f
+        self._mmap = mm
+        self._vocab_size = vocab_size
+        self._n_merges = n_merges
+        self._mask = capacity - 1
+        self._shift = 64 - (capacity.bit_length() - 1)
+        self._keys = view[keys_off:keys_off + 8 * capacity].cast("Q")
+        self._ranks = view[ranks_off:ranks_off + 4 * capacity].cast("I")
+        self._offsets = view[offsets_off:offsets_off + 4 * (vocab_size + 1)].cast("I")
+        self._blob = view[blob_off:blob_off + blob_len]
+        view.release()
+
+        offsets = np.frombuffer(self._offsets, dtype=np.uint32).astype(np.int64)
+        self._decode_tables = (
+            np.frombuffer(self._blob, dtype=np.uint8),
+            offsets[:-1],
+            np.diff(offsets),
+        )
+
+    def close(self) -> None:
+        """Unmap the model file."""
+        # the blob array borrows the mapped buffer and must go first
+        self._decode_tables = None
+        for name in ("_keys", "_ranks", "_offsets", "_blob"):
+            mv = getattr(self, name)
+            if mv is not None:
+                mv.release()
+                setattr(self, name, None)
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __getstate__(self):
+        return {"path": self._path}
+
+    def __setstate__(self, state):
+        self.__init__()
+        if state["path"] is not None:
+            self.load(state["path"])
+
+    def _rank(self, p0: int, p1: int) -> Optional[int]:
+        """Return the token ID the pair merges into, or None."""
+        key = (p0 << 32) | p1
+        keys = self._keys
+        slot = _slot(key, self._shift)
+        while True:
+            k = keys[slot]
+            if k == key:
+                return self._ranks[slot]
+            if k == EMPTY:
+                return None
+            slot = (slot + 1) & self._mask
+
+    def iter_merges(self) -> Iterator[Tuple[int, int, int]]:
+        """Yield (left, right, merged ID) for every merge in the table."""
+        for slot, key in enumerate(self._keys):
+            if key != EMPTY:
+                yield key >> 32, key & 0xFFFFFFFF, self._ranks[slot]
+
+    def _encode_chunk(self, ids: List[int]) -> List[int]:
+        rank = self._rank
+        while len(ids) >= 2:
+            best = None
+            best_pair = None
+            for pair in zip(ids, ids[1:]):
+                r = rank(*pair)
+                if r is not None and (best is None or r < best):
+                    best = r
+                    best_pair = pair
+            if best_pair is None:
+                break
+
+            p0, p1 = best_pair
+            merged = []
+            i = 0
+            n = len(ids)
+            while i < n:
+                if i < n - 1 and ids[i] == p0 and ids[i + 1] == p1:
+                    merged.append(best)
+                    i += 2
+                else:
+                    merged.append(ids[i])
+                    i += 1
+            ids = merged
+        return ids
+
+    def _require_model(self) -> None:
+        if self._keys is None:
+            raise RuntimeError("no model loaded, call load() first")
+
+    def tokenize(self, text: str) -> List[int]:
+        self._require_model()
+        final_ids = []
+        for chunk in _SPLIT_RE.findall(text):
+            final_ids.extend(self._encode_chunk(list(chunk.encode("utf-8"))))
+        return final_ids
+
+    def tokenize_batch(self, texts: List[str]) -> List[List[int]]:
+        return [self.tokenize(t) for t in texts]
+
+    def decode(self, ids: List[int]) -> str:
+        return self.decode_batch([ids])[0]
+
+    def decode_batch(self, batch: List[List[int]]) -> List[str]:
+        self._require_model()
+        texts, _ = gather_decode(*self._decode_tables, batch)
+        return texts
+
+    def decode_batch_with_offsets(
+        self, batch: List[List[int]]
+    ) -> Tuple[List[str], List[np.ndarray]]:
+        self._require_model()
+        return gather_decode(*self._decode_tables, batch, with_offsets=True)
+
+    def vocab_size(self) -> int:
+        return self._vocab_size
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert BPE models between JSON and binary.")
+    parser.add_argument("src")
+    parser.add_argument("dst")
+    parser.add_argument("--to-json", action="store_true", help="convert binary to JSON")
+    args = parser.parse_args()
+    if args.to_json:
+        binary_to_json(args.src, args.dst)
+    else:
+        json_to_binary(args.src, args.dst)
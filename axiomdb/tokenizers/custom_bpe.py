@@ -1,28 +1,128 @@
 import regex as re
 import json
-from typing import List, Dict, Tuple
+import numpy as np
+from typing import List, Dict, Optional, Sequence, Tuple
 from collections import defaultdict
 from .base import BaseTokenizer
 
 
 GPT4_SPLIT_PATTERN = r"""'(?:[sdmt]|ll|ve|re)| ?\p{L}+| ?\p{N}+| ?[^\s\p{L}\p{N}]+|\s+(?!\S)|\s+"""
 
+
+def _char_starts(data: np.ndarray, seq_start: np.ndarray) -> np.ndarray:
+    """
+    Mark the bytes that start a character in the text produced by
+    decoding data with errors="replace".
+
+    A continuation byte only belongs to the character before it when it
+    extends a lead byte that still expects more bytes, within the same
+    sequence, and the lead's second byte is in its valid range. Any other
+    continuation byte decodes to its own U+FFFD, so it starts a character.
+    """
+    n = len(data)
+    b = data.astype(np.int64)
+    cont = (b & 0xC0) == 0x80
+    # expected sequence length of lead bytes; 0 for everything else
+    lead_len = np.select(
+        [(b >= 0xC2) & (b <= 0xDF), (b >= 0xE0) & (b <= 0xEF), (b >= 0xF0) & (b <= 0xF4)],
+        [2, 3, 4],
+        0,
+    )
+    # valid second byte ranges per lead (Unicode table 3-7)
+    prev = np.concatenate(([0], b[:-1]))
+    lo = np.select([prev == 0xE0, prev == 0xF0], [0xA0, 0x90], 0x80)
+    hi = np.select([prev == 0xED, prev == 0xF4], [0x9F, 0x8F], 0xBF)
+    second_ok = cont & (b >= lo) & (b <= hi)
+
+    pos = np.arange(n)
+    attached = np.zeros(n, dtype=bool)
+    for j in (1, 2, 3):
+        ok = cont & (pos - j >= seq_start)
+        ok[:j] = False
+        ok[j:] &= lead_len[:-j] > j
+        ok[j:] &= second_ok[1:n - j + 1]
+        for m in range(1, j - 1):
+            ok[j:] &= cont[m + 1:n - j + m + 1]
+        attached |= ok
+    return ~attached
+
+
+def gather_decode(
+    blob: np.ndarray,
+    starts: np.ndarray,
+    lengths: np.ndarray,
+    batch: Sequence[Sequence[int]],
+    with_offsets: bool = False,
+) -> Tuple[List[str], Optional[List[np.ndarray]]]:
+    """
+    Decode a batch of token ID sequences against a vocab byte blob, where
+    token i is blob[starts[i]:starts[i] + lengths[i]].
+
+    All token bytes of the batch are gathered with a single fancy-index
+    and decoded from one joined buffer. With with_offsets, also returns
+    an (n_tokens, 2) array of [start, end) character offsets per sequence.
+    A token that splits a multi-byte character covers the whole character;
+    bytes that decode to U+FFFD count as one character each, matching the
+    errors="replace" text.
+    """
+    counts = np.array([len(seq) for seq in batch], dtype=np.int64)
+    if counts.sum() == 0:
+        offsets = [np.zeros((0, 2), dtype=np.int64) for _ in batch] if with_offsets else None
+        return ["" for _ in batch], offsets
+    ids = np.concatenate([np.asarray(seq, dtype=np.int64) for seq in batch])
+    if ids.min() < 0 or ids.max() >= len(lengths):
+        raise ValueError(f"token IDs must be in [0, {len(lengths)})")
+
+    tok_len = lengths[ids]
+    tok_end = np.cumsum(tok_len)
+    tok_start = tok_end - tok_len
+    # byte position k of the batch reads blob[starts[id] + (k - tok_start)]
+    pos = np.arange(tok_end[-1], dtype=np.int64) + np.repeat(starts[ids] - tok_start, tok_len)
+    data = blob[pos]
+
+    seq_tok_end = np.cumsum(counts)
+    bounds = np.concatenate(([0], tok_end))
+    seq_byte = bounds[np.concatenate(([0], seq_tok_end))].tolist()
+    raw = data.tobytes()
+    texts = [
+        raw[seq_byte[i]:seq_byte[i + 1]].decode("utf-8", errors="replace")
+        for i in range(len(batch))
+    ]
+    if not with_offsets:
+        return texts, None
+
+    # chars[p] = number of characters that start before byte p
+    seq_bytes = np.diff(seq_byte)
+    seq_start = np.repeat(np.asarray(seq_byte[:-1], dtype=np.int64), seq_bytes)
+    chars = np.concatenate(([0], np.cumsum(_char_starts(data, seq_start))))
+    base = np.repeat(chars[seq_byte[:-1]], counts)
+    spans = np.stack([chars[tok_start + 1] - 1 - base, chars[tok_end] - base], axis=1)
+    offsets = np.split(spans, seq_tok_end[:-1])
+    return texts, offsets
+
+
 class CustomBPETokenizer(BaseTokenizer):
     def __init__(self):
         self.merges: Dict[Tuple[int, int], int] = {}
         self.vocab: Dict[int, bytes] = {}
         self.special_tokens: Dict[str, int] = {}
         self.vocab_size_val = 256
+        self._decode_tables: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
         
         # Initialize base vocabulary (0-255)
         for i in range(256):
             self.vocab[i] = bytes([i])
 
-    def train(self, text: str, vocab_size: int = 30000, verbose: bool = True):
+    def train(self, text: str, vocab_size: int = 30000, verbose: bool = True,
+              num_merges: Optional[int] = None):
         """
         Trains the BPE tokenizer on the provided text corpus.
         This is the pure Python implementation (slow).
+        num_merges, when given, overrides vocab_size - 256.
         """
+        if num_merges is not None:
+            vocab_size = 256 + num_merges
+        self._decode_tables = None
         print(f"Training BPE Tokenizer on {len(text)} characters...")
         
         compiled_pattern = re.compile(GPT4_SPLIT_PATTERN)
@@ -109,6 +209,35 @@ class CustomBPETokenizer(BaseTokenizer):
     def tokenize_batch(self, texts: List[str]) -> List[List[int]]:
         return [self.tokenize(t) for t in texts]
 
+    def _get_decode_tables(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vocab byte blob plus per-token start and length arrays."""
+        if self._decode_tables is None:
+            n = max(self.vocab) + 1
+            tokens = [self.vocab.get(i, b"") for i in range(n)]
+            lengths = np.array([len(t) for t in tokens], dtype=np.int64)
+            starts = np.cumsum(lengths) - lengths
+            blob = np.frombuffer(b"".join(tokens), dtype=np.uint8)
+            self._decode_tables = (blob, starts, lengths)
+        return self._decode_tables
+
+    def decode(self, ids: List[int]) -> str:
+        """Decodes a list of token IDs back into a string."""
+        return self.decode_batch([ids])[0]
+
+    def decode_batch(self, batch: List[List[int]]) -> List[str]:
+        """Decodes a batch of token ID lists with one vectorized gather."""
+        texts, _ = gather_decode(*self._get_decode_tables(), batch)
+        return texts
+
+    def decode_batch_with_offsets(
+        self, batch: List[List[int]]
+    ) -> Tuple[List[str], List[np.ndarray]]:
+        """
+        Decodes a batch and maps every token to its [start, end) character
+        span in the decoded text, as one (n_tokens, 2) array per sequence.
+        """
+        return gather_decode(*self._get_decode_tables(), batch, with_offsets=True)
+
     def vocab_size(self) -> int:
         return self.vocab_size_val
 
@@ -123,6 +252,12 @@ class CustomBPETokenizer(BaseTokenizer):
             json.dump(data, f)
         print(f"Tokenizer saved to {path}")
 
+    def save_binary(self, path: str):
+        """Save the tokenizer merges in the memory-mapped binary format."""
+        from .binary_bpe import write_binary
+        write_binary(self.merges, path)
+        print(f"Tokenizer saved to {path}")
+
     def load(self, path: str):
         """Load the tokenizer merges from a JSON file."""
         with open(path, "r") as f:
@@ -132,6 +267,7 @@ class CustomBPETokenizer(BaseTokenizer):
         self.merges = {tuple(item[:2]): item[2] for item in data["merges"]}
         
         self.vocab = {i: bytes([i]) for i in range(256)}
+        self._decode_tables = None
         sorted_merges = sorted(self.merges.items(), key=lambda x: x[1])
         for (p0, p1), idx in sorted_merges:
             self.vocab[idx] = self.vocab[p0] + self.vocab[p1]
@@ -1,16 +1,23 @@
 from typing import List
-from transformers import AutoTokenizer
 from .base import BaseTokenizer
 
 
 class HFBPETokenizer(BaseTokenizer):
-    """HuggingFace BPE tokenizer adapter."""
+    """HuggingFace BPE tokenizer adapter, loaded on first use."""
 
     def __init__(self, model_name: str = "distilbert-base-uncased"):
-        self._tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self._model_name = model_name
+        self._tokenizer = None
+
+    def _get_tokenizer(self):
+        if self._tokenizer is None:
+            from transformers import AutoTokenizer
+
+            self._tokenizer = AutoTokenizer.from_pretrained(self._model_name)
+        return self._tokenizer
 
     def tokenize(self, text: str) -> List[int]:
-        out = self._tokenizer.encode(
+        out = self._get_tokenizer().encode(
             text,
             truncation=False,
             add_special_tokens=False
@@ -18,7 +25,7 @@ class HFBPETokenizer(BaseTokenizer):
         return out
 
     def tokenize_batch(self, texts: List[str]) -> List[List[int]]:
-        enc = self._tokenizer(
+        enc = self._get_tokenizer()(
             texts,
             truncation=False,
             add_special_tokens=False
@@ -26,4 +33,4 @@ class HFBPETokenizer(BaseTokenizer):
         return enc["input_ids"]
 
     def vocab_size(self) -> int:
-        return self._tokenizer.vocab_size
+        return self._get_tokenizer().vocab_size
@@ -0,0 +1,117 @@
+"""
+SQLiteStore benchmark: insert throughput and k-result hydrate latency.
+
+Compares the tuned store (WAL, bulk statements, batched transactions)
+against the previous implementation, which commits after every add and
+runs one SELECT per ID, on a database file in a temporary directory.
+
+    python benchmarks/bench_sqlite_store.py
+    python benchmarks/bench_sqlite_store.py --rows 50000 --k 100 --queries 200
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+import orjson
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from axiomdb.store.sqlite_store import SQLiteStore  # noqa: E402
+
+
+class LegacySQLiteStore:
+    """The store as it was before bulk operations: default pragmas, commit per write."""
+
+    def __init__(self, path):
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS metadata (id INTEGER PRIMARY KEY, data BLOB NOT NULL)")
+        self._conn.commit()
+
+    def add(self, internal_id, metadata):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO metadata (id, data) VALUES (?, ?)",
+            (internal_id, orjson.dumps(metadata)),
+        )
+        self._conn.commit()
+
+    def get(self, internal_id):
+        row = self._conn.execute("SELECT data FROM metadata WHERE id = ?", (internal_id,)).fetchone()
+        return None if row is None else orjson.loads(row[0])
+
+    def close(self):
+        self._conn.close()
+
+
+def _meta(i):
+    return {"source": f"doc{i // 50}.pdf", "page": i % 50, "text": "lorem ipsum dolor sit amet " * 8}
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--legacy-rows", type=int, default=2000,
+                        help="rows for the legacy insert run, which fsyncs per row")
+    parser.add_argument("--k", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    ids = list(range(args.rows))
+    metas = [_meta(i) for i in ids]
+    rng = random.Random(0)
+    queries = [rng.sample(ids, args.k) for _ in range(args.queries)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = LegacySQLiteStore(os.path.join(tmp, "legacy.sqlite"))
+        n = min(args.legacy_rows, args.rows)
+        legacy_insert = _timed(lambda: [legacy.add(i, metas[i]) for i in range(n)])
+        legacy_rate = n / legacy_insert
+        for start in range(n, args.rows, args.batch):
+            # fill the rest quickly so hydrate runs on the same data size
+            with legacy._conn:
+                legacy._conn.executemany(
+                    "INSERT OR REPLACE INTO metadata (id, data) VALUES (?, ?)",
+                    [(i, orjson.dumps(metas[i])) for i in ids[start:start + args.batch]],
+                )
+
+        store = SQLiteStore(os.path.join(tmp, "tuned.sqlite"))
+
+        def bulk_insert():
+            for start in range(0, args.rows, args.batch):
+                store.add_many(ids[start:start + args.batch], metas[start:start + args.batch])
+
+        tuned_insert = _timed(bulk_insert)
+        tuned_rate = args.rows / tuned_insert
+
+        single = SQLiteStore(os.path.join(tmp, "single.sqlite"))
+        single_rate = n / _timed(lambda: [single.add(i, metas[i]) for i in range(n)])
+
+        legacy_hydrate = _timed(lambda: [[legacy.get(i) for i in q] for q in queries])
+        tuned_hydrate = _timed(lambda: [store.get_many(q) for q in queries])
+
+        legacy.close()
+        store.close()
+        single.close()
+
+    hydrate = f"hydrate k={args.k} ms/query"
+    for label, value in (
+        ("insert rows/sec, legacy (commit per row)", f"{legacy_rate:,.0f}"),
+        ("insert rows/sec, tuned add (WAL, NORMAL)", f"{single_rate:,.0f}"),
+        ("insert rows/sec, tuned add_many", f"{tuned_rate:,.0f}"),
+        (f"{hydrate}, legacy (get per id)", f"{legacy_hydrate * 1000 / args.queries:.3f}"),
+        (f"{hydrate}, tuned get_many", f"{tuned_hydrate * 1000 / args.queries:.3f}"),
+    ):
+        print(f"{label:<44} {value:>12}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Startup-time benchmark for AxiomDB.
+
+Runs a fresh interpreter with `python -X importtime`, prints the slowest
+imports by cumulative time and the time to build the standard stack
+(tokenizer, encoder, index, store, AxiomDB) without touching any model.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --top 30 --max-ms 500
+
+With --max-ms the script exits non-zero when startup exceeds the budget,
+so it can guard against regressions in CI.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STARTUP_SNIPPET = """
+import time
+t0 = time.perf_counter()
+from axiomdb.core import AxiomDB
+from axiomdb.tokenizers.hf_bpe import HFBPETokenizer
+from axiomdb.encoders.hf_bert import HFBERTEncoder
+from axiomdb.index.hnswlib_index import HNSWLibIndex
+from axiomdb.store.sqlite_store import SQLiteStore
+t1 = time.perf_counter()
+idx = HNSWLibIndex()
+idx.init(dim=768, max_elements=1000)
+db = AxiomDB(HFBPETokenizer(), HFBERTEncoder(), idx, SQLiteStore(":memory:"))
+t2 = time.perf_counter()
+print(f"{(t1 - t0) * 1000:.3f} {(t2 - t1) * 1000:.3f}")
+"""
+
+
+def run_importtime() -> Tuple[float, float, List[Tuple[int, int, str]]]:
+    """Return (import ms, construct ms, [(self us, cumulative us, module)])."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_SNIPPET],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(self_us), int(cum_us), name.rstrip()))
+    import_ms, construct_ms = (float(x) for x in proc.stdout.split())
+    return import_ms, construct_ms, rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--top", type=int, default=15, help="number of imports to show")
+    parser.add_argument("--max-ms", type=float, default=None, help="fail above this startup time")
+    args = parser.parse_args()
+
+    import_ms, construct_ms, rows = run_importtime()
+
+    print(f"{'self ms':>10} {'cumul ms':>10}  module")
+    for self_us, cum_us, name in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+        print(f"{self_us / 1000:10.2f} {cum_us / 1000:10.2f}  {name}")
+
+    heavy = [name.strip() for _, _, name in rows
+             if name.strip() in ("torch", "transformers", "hnswlib", "sqlite3")]
+    total_ms = import_ms + construct_ms
+    print()
+    print(f"modules imported:   {len(rows)}")
+    print(f"heavy imports:      {', '.join(heavy) or 'none'}")
+    print(f"import axiomdb:     {import_ms:.1f} ms")
+    print(f"build stack:        {construct_ms:.1f} ms")
+    print(f"total:              {total_ms:.1f} ms")
+
+    if args.max_ms is not None and total_ms > args.max_ms:
+        print(f"FAIL: startup {total_ms:.1f} ms exceeds budget {args.max_ms:.1f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
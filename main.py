@@ -24,12 +24,7 @@ def main():
     print(f"Token IDs: {token_ids}")
 
     # Decode (Reconstruct text from IDs)
-    # Since we implemented a byte-level BPE, we reconstruct by joining bytes
-    decoded_bytes = b""
-    for idx in token_ids:
-        decoded_bytes += tokenizer.vocab[idx]
-    
-    decoded_text = decoded_bytes.decode("utf-8", errors="replace")
+    decoded_text = tokenizer.decode(token_ids)
     print(f"Decoded Text: '{decoded_text}'")
 
     # Verification
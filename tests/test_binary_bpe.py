@@ -0,0 +1,100 @@
+import pytest
+import json
+import pickle
+from axiomdb.tokenizers.custom_bpe import CustomBPETokenizer
+from axiomdb.tokenizers.binary_bpe import BinaryBPETokenizer, binary_to_json, json_to_binary
+
+TEXT = "the quick brown fox jumps over the lazy dog, the dog sleeps. héllo wörld " * 10
+
+
+def _trained():
+    tok = CustomBPETokenizer()
+    tok.train(TEXT, vocab_size=320, verbose=False)
+    return tok
+
+
+def test_binary_matches_json(tmp_path):
+    tok = _trained()
+    json_path = str(tmp_path / "tok.json")
+    bin_path = str(tmp_path / "tok.bin")
+    tok.save(json_path)
+    json_to_binary(json_path, bin_path)
+
+    btok = BinaryBPETokenizer()
+    btok.load(bin_path)
+
+    text = "the lazy fox says héllo to the dogs!"
+    assert btok.vocab_size() == tok.vocab_size()
+    assert btok.tokenize(text) == tok.tokenize(text)
+    assert btok.decode(btok.tokenize(text)) == text
+    btok.close()
+
+
+def test_binary_roundtrip_to_json(tmp_path):
+    tok = _trained()
+    bin_path = str(tmp_path / "tok.bin")
+    json_path = str(tmp_path / "tok.json")
+    tok.save_binary(bin_path)
+    binary_to_json(bin_path, json_path)
+
+    with open(json_path) as f:
+        data = json.load(f)
+    assert data["vocab_size"] == tok.vocab_size()
+    assert {(a, b): idx for a, b, idx in data["merges"]} == tok.merges
+
+
+def test_binary_pickles_by_path(tmp_path):
+    bin_path = str(tmp_path / "tok.bin")
+    _trained().save_binary(bin_path)
+
+    btok = BinaryBPETokenizer()
+    btok.load(bin_path)
+    payload = pickle.dumps(btok)
+    assert len(payload) < 200
+
+    clone = pickle.loads(payload)
+    assert clone.tokenize("quick brown fox") == btok.tokenize("quick brown fox")
+    clone.close()
+    btok.close()
+
+
+def test_binary_decode_batch(tmp_path):
+    tok = _trained()
+    bin_path = str(tmp_path / "tok.bin")
+    tok.save_binary(bin_path)
+
+    btok = BinaryBPETokenizer()
+    btok.load(bin_path)
+    texts = ["the quick fox", "", "wörld"]
+    batch = [tok.tokenize(t) for t in texts]
+    assert btok.decode_batch(batch) == texts
+
+    _, offsets = btok.decode_batch_with_offsets(batch)
+    _, expected = tok.decode_batch_with_offsets(batch)
+    assert all((a == b).all() for a, b in zip(offsets, expected))
+    btok.close()
+
+
+def test_binary_requires_loaded_model():
+    btok = BinaryBPETokenizer()
+    for call in (lambda: btok.tokenize("x"), lambda: btok.decode([1]), lambda: btok.decode_batch([[1]])):
+        with pytest.raises(RuntimeError, match="no model loaded"):
+            call()
+
+
+def test_binary_rejects_truncated_file(tmp_path):
+    bin_path = tmp_path / "tok.bin"
+    _trained().save_binary(str(bin_path))
+    data = bin_path.read_bytes()
+
+    btok = BinaryBPETokenizer()
+    for size in (0, 16, len(data) - 1):
+        bin_path.write_bytes(data[:size])
+        with pytest.raises(ValueError, match="is corrupt"):
+            btok.load(str(bin_path))
+        assert btok._mmap is None and btok._file is None
+
+    bin_path.write_bytes(data)
+    btok.load(str(bin_path))
+    assert btok.decode(btok.tokenize("the dog")) == "the dog"
+    btok.close()
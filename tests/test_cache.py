@@ -0,0 +1,46 @@
+import time
+from axiomdb.cache import QueryCache
+
+
+def test_cache_hit_and_normalization():
+    cache = QueryCache()
+    assert cache.get("hello world", 5, 0) is None
+
+    cache.put("hello world", 5, 0, ["doc1", "doc2"], cost=0.25)
+    assert cache.get("  hello   world ", 5, 0) == ["doc1", "doc2"]
+    assert cache.get("hello world", 3, 0) is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["saved_seconds"] == 0.25
+
+
+def test_cache_generation_invalidates():
+    cache = QueryCache()
+    cache.put("q", 1, 0, ["doc1"], cost=0.1)
+    assert cache.get("q", 1, 1) is None
+    assert len(cache) == 0
+
+
+def test_cache_ttl():
+    cache = QueryCache(ttl=0.01)
+    cache.put("q", 1, 0, ["doc1"], cost=0.1)
+    time.sleep(0.02)
+    assert cache.get("q", 1, 0) is None
+
+
+def test_cache_lru_byte_bound():
+    probe = QueryCache()
+    probe.put("q0", 1, 0, ["doc0"], cost=0.0)
+    entry_bytes = probe.stats()["bytes"]
+
+    cache = QueryCache(max_bytes=2 * entry_bytes)
+    cache.put("q0", 1, 0, ["doc0"], cost=0.0)
+    cache.put("q1", 1, 0, ["doc1"], cost=0.0)
+    assert cache.get("q0", 1, 0) == ["doc0"]
+
+    cache.put("q2", 1, 0, ["doc2"], cost=0.0)
+    assert cache.get("q1", 1, 0) is None
+    assert cache.get("q0", 1, 0) == ["doc0"]
+    assert cache.stats()["evictions"] == 1
@@ -1,10 +1,44 @@
+import numpy as np
+import pytest
 from axiomdb.core import AxiomDB
+from axiomdb.cache import QueryCache
+from axiomdb.encoders.base import BaseEncoder
+from axiomdb.tokenizers.base import BaseTokenizer
+from axiomdb.tokenizers.custom_bpe import CustomBPETokenizer
 from axiomdb.tokenizers.hf_bpe import HFBPETokenizer
 from axiomdb.encoders.hf_bert import HFBERTEncoder
 from axiomdb.index.hnswlib_index import HNSWLibIndex
 from axiomdb.store.sqlite_store import SQLiteStore
 
 
+class RecordingEncoder(BaseEncoder):
+    """Embeds every sequence as ones and remembers what it was given."""
+
+    def __init__(self):
+        self.seen = []
+
+    def embed_tokens(self, ids):
+        self.seen.append(list(ids))
+        return np.ones(self.dim(), dtype=np.float32)
+
+    def embed_tokens_batch(self, batch_ids):
+        return np.stack([self.embed_tokens(ids) for ids in batch_ids])
+
+    def dim(self):
+        return 4
+
+
+class WhitespaceTokenizer(BaseTokenizer):
+    def tokenize(self, text):
+        return [len(w) for w in text.split()]
+
+    def tokenize_batch(self, texts):
+        return [self.tokenize(t) for t in texts]
+
+    def vocab_size(self):
+        return 0
+
+
 def test_axiomdb_end_to_end():
     tok = HFBPETokenizer()
     enc = HFBERTEncoder()
@@ -22,3 +56,82 @@ def test_axiomdb_end_to_end():
 
     meta = db.get_metadata("doc1")
     assert meta["x"] == 1
+
+
+def test_axiomdb_search_cache():
+    tok = HFBPETokenizer()
+    enc = HFBERTEncoder()
+    idx = HNSWLibIndex()
+    idx.init(dim=enc.dim(), max_elements=100)
+    store = SQLiteStore(":memory:")
+
+    db = AxiomDB(tok, enc, idx, store, cache=QueryCache())
+
+    db.add("doc1", "hello world", {"x": 1})
+    db.add("doc2", "vector search testing", {"x": 2})
+
+    assert db.search("hello", k=1) == ["doc1"]
+    assert db.search("hello ", k=1) == ["doc1"]
+    assert db.cache_stats()["hits"] == 1
+
+    # deleting bumps the generation, so the cached result is not served
+    assert db.delete("doc1")
+    assert db.search("hello", k=1) == ["doc2"]
+    assert db.cache_stats()["hits"] == 1
+
+
+def test_axiomdb_delete_index_failure_keeps_document():
+    idx = HNSWLibIndex()
+    idx.init(dim=4, max_elements=10)
+    db = AxiomDB(HFBPETokenizer(), HFBERTEncoder(), idx, SQLiteStore(":memory:"))
+    db.add_embeddings(["doc1"], np.ones((1, 4), dtype=np.float32), [{"x": 1}])
+    generation = db.generation()
+
+    def fail(internal_id):
+        raise RuntimeError("mark_deleted failed")
+
+    idx.delete = fail
+    with pytest.raises(RuntimeError):
+        db.delete("doc1")
+
+    assert db.get_metadata("doc1") == {"x": 1}
+    assert db.generation() == generation
+
+
+def test_axiomdb_search_cache_tokenizes_normalized_query():
+    tok = CustomBPETokenizer()
+    tok.train("a b " * 50, vocab_size=260, verbose=False)
+    # whitespace changes the token IDs
+    assert tok.tokenize("a  b") != tok.tokenize("a b")
+
+    enc = RecordingEncoder()
+    idx = HNSWLibIndex()
+    idx.init(dim=enc.dim(), max_elements=10)
+    db = AxiomDB(tok, enc, idx, SQLiteStore(":memory:"), cache=QueryCache())
+    db.add_embeddings(["doc1"], np.ones((1, 4), dtype=np.float32), [{"x": 1}])
+
+    # the miss is computed from the cache key, so the later hit for
+    # "a b" is exactly what an uncached search for "a b" returns
+    db.search("a  b", k=1)
+    assert enc.seen == [tok.tokenize("a b")]
+    db.search("a b", k=1)
+    assert db.cache_stats()["hits"] == 1
+    assert len(enc.seen) == 1
+
+
+def test_axiomdb_search_after_delete_clamps_k():
+    enc = RecordingEncoder()
+    idx = HNSWLibIndex()
+    idx.init(dim=enc.dim(), max_elements=10)
+    db = AxiomDB(WhitespaceTokenizer(), enc, idx, SQLiteStore(":memory:"))
+    vecs = np.eye(3, 4, dtype=np.float32) + 0.1
+    db.add_embeddings(["doc1", "doc2", "doc3"], vecs, [{}, {}, {}])
+
+    assert db.delete("doc2")
+    assert idx.size() == 2
+    assert sorted(db.search("anything", k=3)) == ["doc1", "doc3"]
+
+    db.delete("doc1")
+    db.delete("doc3")
+    assert idx.size() == 0
+    assert db.search("anything", k=3) == []
@@ -1,3 +1,4 @@
+import pytest
 from axiomdb.tokenizers.custom_bpe import CustomBPETokenizer
 
 def test_train_and_tokenize():
@@ -18,3 +19,38 @@ def test_decode_roundtrip():
 
     assert "attention" in decoded
     assert "need" in decoded
+
+def test_decode_batch_with_offsets():
+    tok = CustomBPETokenizer()
+    tok.train("héllo wörld the cat sat on the mat " * 5, num_merges=40)
+
+    texts = ["héllo the mat", "", "wörld ✓"]
+    batch = [tok.tokenize(t) for t in texts]
+    assert tok.decode_batch(batch) == texts
+
+    decoded, offsets = tok.decode_batch_with_offsets(batch)
+    assert decoded == texts
+    for text, ids, spans in zip(texts, batch, offsets):
+        assert spans.shape == (len(ids), 2)
+        for idx, (start, end) in zip(ids, spans.tolist()):
+            # a token splitting a multi-byte character covers that character
+            assert tok.vocab[idx] in text[start:end].encode("utf-8")
+
+
+def test_offsets_start_mid_character():
+    tok = CustomBPETokenizer()
+    tok.train("héllo wörld", num_merges=0)
+
+    # 0xa9 is the second byte of "é"; a window cut there decodes it as U+FFFD
+    texts, offsets = tok.decode_batch_with_offsets([[0xA9, ord("x")], [0xA9, 0xA9, ord("A")]])
+    assert texts == ["�x", "��A"]
+    assert offsets[0].tolist() == [[0, 1], [1, 2]]
+    assert offsets[1].tolist() == [[0, 1], [1, 2], [2, 3]]
+
+
+def test_decode_rejects_out_of_range_ids():
+    tok = CustomBPETokenizer()
+    tok.train("hello", num_merges=0)
+    for ids in ([-1], [tok.vocab_size()]):
+        with pytest.raises(ValueError):
+            tok.decode(ids)
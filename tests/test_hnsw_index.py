@@ -1,5 +1,6 @@
 import numpy as np
 from axiomdb.index.hnswlib_index import HNSWLibIndex
+from axiomdb.index.autotune import EfAutotuner, exact_knn
 
 
 def test_index_add_and_search():
@@ -18,3 +19,86 @@ def test_index_add_and_search():
     assert len(res_ids) == 3
     assert len(res_dist) == 3
     assert res_ids[0] == 0
+
+
+def test_search_ef_override():
+    dim = 8
+    idx = HNSWLibIndex()
+    idx.init(dim=dim, max_elements=100)
+    vecs = np.random.rand(50, dim).astype(np.float32)
+    idx.add_batch(vecs, list(range(50)))
+
+    res_ids, _ = idx.search(vecs[3], k=5, ef=100)
+    assert res_ids[0] == 3
+
+    # ef never drops below k
+    idx.set_ef_policy({10: 4})
+    assert idx.ef_for(10) == 10
+    assert idx.ef_for(1) == 4
+
+
+def _recall(idx, queries, k):
+    expected = exact_knn(idx, queries, k)
+    labels, _ = idx.search_batch(queries, k, record=False)
+    return np.mean([len(set(a) & set(b)) / k for a, b in zip(labels.tolist(), expected.tolist())])
+
+
+def test_autotuner_meets_target_recall_on_held_out_queries():
+    dim = 32
+    rng = np.random.default_rng(0)
+    idx = HNSWLibIndex()
+    idx.init(dim=dim, max_elements=5000)
+
+    tuner = EfAutotuner(target_recall=0.9, ks=(1, 10), sample_size=100, min_queries=100, min_size=1000)
+    idx.set_autotuner(tuner)
+    idx.add_batch(rng.standard_normal((500, dim)).astype(np.float32), list(range(500)))
+
+    # search traffic is collected as held-out tuning queries
+    for q in rng.standard_normal((100, dim)).astype(np.float32):
+        idx.search(q, k=1)
+
+    # crossing min_size makes a tune due, but writes never run it
+    idx.add_batch(rng.standard_normal((1500, dim)).astype(np.float32), list(range(500, 2000)))
+    assert idx.needs_retune()
+    assert idx.ef_policy() == {}
+
+    assert idx.maybe_retune()
+    assert not idx.needs_retune()
+    policy = idx.ef_policy()
+    assert set(policy) == {1, 10}
+
+    fresh = rng.standard_normal((100, dim)).astype(np.float32)
+    for k in (1, 10):
+        assert _recall(idx, fresh, k) >= 0.85
+
+    assert not tuner.should_retune(3000)
+    assert tuner.should_retune(4000)
+
+
+def test_autotuner_needs_held_out_queries():
+    dim = 8
+    rng = np.random.default_rng(0)
+    idx = HNSWLibIndex()
+    idx.init(dim=dim, max_elements=100)
+    idx.add_batch(rng.standard_normal((50, dim)).astype(np.float32), list(range(50)))
+
+    tuner = EfAutotuner(ks=(1,), min_queries=10, min_size=10)
+    assert tuner.tune(idx) == {}
+    assert tuner.tune(idx, queries=rng.standard_normal((10, dim))) != {}
+
+
+def test_concurrent_searches_with_ef_overrides():
+    from concurrent.futures import ThreadPoolExecutor
+
+    dim = 16
+    rng = np.random.default_rng(0)
+    idx = HNSWLibIndex()
+    idx.init(dim=dim, max_elements=2000)
+    idx.add_batch(rng.standard_normal((2000, dim)).astype(np.float32), list(range(2000)))
+    queries = rng.standard_normal((200, dim)).astype(np.float32)
+    efs = [10 if i % 2 else 400 for i in range(len(queries))]
+
+    serial = [idx.search(q, k=10, ef=ef)[0] for q, ef in zip(queries, efs)]
+    with ThreadPoolExecutor(8) as pool:
+        parallel = list(pool.map(lambda a: idx.search(a[0], k=10, ef=a[1])[0], zip(queries, efs)))
+    assert parallel == serial
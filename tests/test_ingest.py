@@ -0,0 +1,112 @@
+import numpy as np
+import pymupdf
+from axiomdb.core import AxiomDB
+from axiomdb.ingest import IngestPipeline, chunk_text
+from axiomdb.encoders.base import BaseEncoder
+from axiomdb.tokenizers.base import BaseTokenizer
+from axiomdb.tokenizers.hf_bpe import HFBPETokenizer
+from axiomdb.encoders.hf_bert import HFBERTEncoder
+from axiomdb.index.autotune import EfAutotuner
+from axiomdb.index.hnswlib_index import HNSWLibIndex
+from axiomdb.store.sqlite_store import SQLiteStore
+
+
+class WordTokenizer(BaseTokenizer):
+    """One token per word, so chunk sizes are easy to reason about."""
+
+    def tokenize(self, text):
+        return [len(w) for w in text.split()]
+
+    def tokenize_batch(self, texts):
+        return [self.tokenize(t) for t in texts]
+
+    def vocab_size(self):
+        return 0
+
+
+class HashEncoder(BaseEncoder):
+    """Deterministic pseudo-random vector per token sequence."""
+
+    def embed_tokens(self, ids):
+        rng = np.random.default_rng(hash(tuple(ids)) & 0xFFFFFFFF)
+        return rng.standard_normal(self.dim()).astype(np.float32)
+
+    def embed_tokens_batch(self, batch_ids):
+        return np.stack([self.embed_tokens(ids) for ids in batch_ids])
+
+    def dim(self):
+        return 8
+
+
+def _write_pdf(path, pages):
+    doc = pymupdf.open()
+    for text in pages:
+        page = doc.new_page()
+        page.insert_text((72, 72), text)
+    doc.save(path)
+    doc.close()
+
+
+def test_chunk_text_overlap():
+    text = " ".join(f"w{i}" for i in range(10))
+    chunks = chunk_text(WordTokenizer(), text, chunk_tokens=4, overlap_tokens=1)
+
+    assert [c[0] for c in chunks] == [
+        "w0 w1 w2 w3",
+        "w3 w4 w5 w6",
+        "w6 w7 w8 w9",
+    ]
+    assert all(len(ids) <= 4 for _, ids in chunks)
+
+
+def test_chunk_text_empty():
+    assert chunk_text(WordTokenizer(), "   \n ", chunk_tokens=4, overlap_tokens=1) == []
+
+
+def test_ingest_pipeline_pdf(tmp_path):
+    path = str(tmp_path / "doc.pdf")
+    _write_pdf(path, ["hello world", "vector search testing"])
+
+    enc = HFBERTEncoder()
+    idx = HNSWLibIndex()
+    idx.init(dim=enc.dim(), max_elements=100)
+    db = AxiomDB(HFBPETokenizer(), enc, idx, SQLiteStore(":memory:"))
+
+    pipeline = IngestPipeline(db, chunk_tokens=16, overlap_tokens=4, batch_size=4,
+                              extract_workers=1, tokenize_workers=1)
+    stats = pipeline.run([path])
+
+    assert [s.name for s in stats] == ["extract", "tokenize", "encode", "write"]
+    assert stats[0].items == 2
+    assert stats[-1].items == db.count() == 2
+    for s in stats:
+        assert s.busy() <= s.elapsed
+        assert s.busy_throughput() >= s.throughput()
+
+    results = db.search("hello", k=1)
+    assert results[0] == f"{path}#p0#c0"
+    assert db.get_metadata(results[0])["text"] == "hello world"
+
+
+def test_ingest_pipeline_retunes_grown_index(tmp_path):
+    path = str(tmp_path / "doc.pdf")
+    pages = ["\n".join(" ".join(f"p{p}w{i}x{j}" for j in range(4)) for i in range(10)) for p in range(3)]
+    _write_pdf(path, pages)
+
+    enc = HashEncoder()
+    idx = HNSWLibIndex()
+    idx.init(dim=enc.dim(), max_elements=100)
+    tuner = EfAutotuner(ks=(1, 5), sample_size=20, min_queries=20, min_size=20)
+    tuner.record_queries(np.random.default_rng(0).standard_normal((20, enc.dim())))
+    idx.set_autotuner(tuner)
+    db = AxiomDB(WordTokenizer(), enc, idx, SQLiteStore(":memory:"))
+
+    pipeline = IngestPipeline(db, chunk_tokens=4, overlap_tokens=1, batch_size=8,
+                              extract_workers=1, tokenize_workers=1)
+    pipeline.run([path])
+
+    # crossing min_size made a re-tune due and the run performed it
+    assert db.count() >= 20
+    assert tuner.last_report
+    assert set(idx.ef_policy()) == {1, 5}
+    assert not idx.needs_retune()
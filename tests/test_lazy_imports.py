@@ -0,0 +1,35 @@
+import subprocess
+import sys
+
+HEAVY = ["torch", "transformers", "hnswlib", "sqlite3"]
+
+
+def _loaded_after(code):
+    probe = code + f"\nimport sys\nprint(' '.join(m for m in {HEAVY!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+    return out.stdout.split()
+
+
+def test_import_package_is_light():
+    assert _loaded_after("import axiomdb, axiomdb.core, axiomdb.ingest") == []
+
+
+def test_build_stack_is_light():
+    code = """
+from axiomdb import AxiomDB
+from axiomdb.tokenizers import HFBPETokenizer
+from axiomdb.encoders import HFBERTEncoder
+from axiomdb.index import HNSWLibIndex
+from axiomdb.store import SQLiteStore
+idx = HNSWLibIndex()
+idx.init(dim=768, max_elements=10)
+db = AxiomDB(HFBPETokenizer(), HFBERTEncoder(), idx, SQLiteStore(":memory:"))
+"""
+    assert _loaded_after(code) == []
+
+
+def test_encoder_dim_without_forward_pass():
+    loaded = _loaded_after(
+        "from axiomdb.encoders import HFBERTEncoder\nassert HFBERTEncoder().dim() == 768"
+    )
+    assert "torch" not in loaded
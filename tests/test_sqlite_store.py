@@ -1,3 +1,4 @@
+import pytest
 from axiomdb.store.sqlite_store import SQLiteStore
 
 
@@ -12,3 +13,43 @@ def test_store_basic():
 
     store.delete(0)
     assert store.count() == 1
+
+
+def test_store_bulk():
+    store = SQLiteStore(":memory:")
+
+    store.add_many([0, 1, 2], [{"text": "a"}, {"text": "b"}, {"text": "c"}])
+    assert store.count() == 3
+
+    metas = store.get_many([2, 5, 0])
+    assert metas[0]["text"] == "c"
+    assert metas[1] is None
+    assert metas[2]["text"] == "a"
+
+    store.delete_many([0, 2])
+    assert store.count() == 1
+    assert store.get_many([]) == []
+
+    with pytest.raises(ValueError):
+        store.add_many([3, 4], [{"text": "d"}])
+    assert store.count() == 1
+
+
+def test_store_transaction_wal(tmp_path):
+    path = str(tmp_path / "meta.sqlite")
+    store = SQLiteStore(path, synchronous="normal")
+
+    with store.transaction():
+        store.add(0, {"text": "hello"})
+        store.add(1, {"text": "world"})
+
+    try:
+        with store.transaction():
+            store.add(2, {"text": "lost"})
+            raise RuntimeError
+    except RuntimeError:
+        pass
+
+    assert store.count() == 2
+    assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    store.close()